@@ -1,14 +0,0 @@
-"""
-URL configuration for graphql_crm project.
-
-graphql_crm/urls.py
-"""
-from django.contrib import admin
-from django.urls import path
-from graphene_django.views import GraphQLView
-from django.views.decorators.csrf import csrf_exempt
-
-urlpatterns = [
-    path('admin/', admin.site.urls),
-    path('graphql/', csrf_exempt(GraphQLView.as_view(graphiql=True)))
-]
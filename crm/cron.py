@@ -1,26 +1,34 @@
-import datetime, requests
+import datetime
+import os
+from crm import services
 # from gql.transport.requests import RequestsHTTPTransport
 # from gql import gql, Client
 
+def append_log(path, text):
+    """Append pre-formatted lines with a single O_APPEND write
+
+    One syscall per cron tick instead of one per line, and O_APPEND keeps
+    the write atomic against concurrent cron runs.
+    """
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, text.encode())
+    finally:
+        os.close(fd)
+
 def log_crm_heartbeat():
     timestamp = datetime.datetime.now().strftime("%d/%m/%Y-%H:%M:%S")
-    with open("/tmp/crm_heartbeat_log.txt", "a") as f:
-        f.write(f"{timestamp} CRM is alive\n")
+    append_log("/tmp/crm_heartbeat_log.txt", f"{timestamp} CRM is alive\n")
 
 def update_low_stock():
-    endpoint = "http://localhost:8000/graphql"
-    mutation = """
-    mutation {
-      updateLowStockProducts {
-        updatedProducts { name stock }
-        message
-      }
-    }
-    """
-    response = requests.post(endpoint, json={"query": mutation})
-    data = response.json().get("data", {}).get("updateLowStockProducts", {})
+    # The cron job runs inside the same codebase as the mutation, so call
+    # the service directly - no HTTP hop, JSON parse, or GraphQL validation
+    updated = services.update_low_stock_products()
 
     timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    with open("/tmp/low_stock_updates_log.txt", "a") as f:
-        for p in data.get("updatedProducts", []):
-            f.write(f"{timestamp} - {p['name']} restocked to {p['stock']}\n")
+    lines = "".join(
+        f"{timestamp} - {p.name} restocked to {p.stock}\n"
+        for p in updated
+    )
+    if lines:
+        append_log("/tmp/low_stock_updates_log.txt", lines)
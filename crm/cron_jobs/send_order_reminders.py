@@ -1,27 +1,32 @@
 #!/usr/bin/env python3
-import datetime, requests
-# from gql import gql, Client 
+import datetime
+import os
+import sys
 
-endpoint = "http://localhost:8000/graphql"
+# Bootstrap Django so the script can hit the ORM directly instead of
+# posting GraphQL back to its own server
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'graphql_crm.settings')
 
-# Query the new orders_last7days field
-query = """
-query {
-  ordersLast7days {
-    id
-    customer {
-      email
-    }
-  }
-}
-"""
+import django
+django.setup()
 
-response = requests.post(endpoint, json={"query": query})
-data = response.json().get("data", {}).get("ordersLast7days", [])
+from crm.services import recent_order_reminders
+
+reminders = recent_order_reminders(days=7)
 
 timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-with open("/tmp/order_reminders_log.txt", "a") as f:
-    for order in data:
-        f.write(f"{timestamp} - Order {order['id']} reminder for {order['customer']['email']}\n")
+lines = "".join(
+    f"{timestamp} - Order {order_id} reminder for {email}\n"
+    for order_id, email in reminders
+)
+if lines:
+    # Single O_APPEND write: one syscall for the whole batch, atomic
+    # against concurrent runs
+    fd = os.open("/tmp/order_reminders_log.txt", os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, lines.encode())
+    finally:
+        os.close(fd)
 
 print("Order reminders processed!")
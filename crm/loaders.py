@@ -0,0 +1,75 @@
+# crm/loaders.py
+import asyncio
+from collections import defaultdict
+
+from asgiref.sync import sync_to_async
+from django.db.models import QuerySet
+from graphene.utils.dataloader import DataLoader
+
+from .models import Customer, Order
+
+
+class CustomerLoader(DataLoader):
+    """Batch customer-by-id lookups into one WHERE id IN (...) query"""
+
+    async def batch_load_fn(self, keys):
+        # sync_to_async moves the ORM call off the event loop - calling it
+        # directly from a coroutine raises SynchronousOnlyOperation
+        by_id = await sync_to_async(Customer.objects.in_bulk)(keys)
+        return [by_id.get(key) for key in keys]
+
+
+class ProductsByOrderLoader(DataLoader):
+    """Batch products-for-order lookups through the M2M table in one query"""
+
+    @staticmethod
+    def _load(keys):
+        through = Order.products.through
+        rows = through.objects.filter(order_id__in=keys).select_related('product')
+        by_order = defaultdict(list)
+        for row in rows:
+            by_order[row.order_id].append(row.product)
+        return [by_order.get(key, []) for key in keys]
+
+    async def batch_load_fn(self, keys):
+        return await sync_to_async(self._load)(keys)
+
+
+def attach_loaders(context):
+    """Attach fresh per-request loaders to a GraphQL context"""
+    context.customer_loader = CustomerLoader()
+    context.products_by_order_loader = ProductsByOrderLoader()
+    return context
+
+
+class LoaderMiddleware:
+    """Graphene middleware that lazily attaches the loaders per request
+
+    Loaders are only attached under async execution - DataLoader batching
+    rides the event loop, and handing a pending future to a sync executor
+    would leak it into the response. Sync execution marks the context so
+    the check runs once per request and the type resolvers fall back to
+    the optimizer's select_related/prefetch plan.
+
+    Under async execution, QuerySet results are additionally materialized
+    through sync_to_async: iterating them on the event loop would raise
+    SynchronousOnlyOperation, and graphql-core awaits the coroutine for us.
+    """
+
+    def resolve(self, next, root, info, **args):
+        context = info.context
+        if context is not None and not hasattr(context, 'customer_loader'):
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                context.customer_loader = None
+                context.products_by_order_loader = None
+            else:
+                attach_loaders(context)
+        result = next(root, info, **args)
+        if (
+            isinstance(result, QuerySet)
+            and getattr(context, 'customer_loader', None) is not None
+        ):
+            return sync_to_async(list)(result)
+        return result
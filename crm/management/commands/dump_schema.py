@@ -0,0 +1,31 @@
+import os
+from django.core.management.base import BaseCommand
+
+# SDL snapshot of the live schema; kept in sync by this command and
+# guarded by SchemaSnapshotTests
+SCHEMA_SDL_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', '..', 'schema.graphql'
+)
+SCHEMA_SDL_PATH = os.path.normpath(SCHEMA_SDL_PATH)
+
+
+class Command(BaseCommand):
+    help = "Dump the GraphQL schema SDL to crm/schema.graphql"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--out', default=SCHEMA_SDL_PATH,
+            help="Output path for the SDL file (default: crm/schema.graphql)"
+        )
+
+    def handle(self, *args, **options):
+        # Imported here so the command stays cheap to discover
+        from crm.schema import schema
+
+        out = options['out']
+        with open(out, 'w') as f:
+            f.write(str(schema))
+            f.write('\n')
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote schema SDL to {os.path.relpath(out)}"
+        ))
@@ -4,7 +4,8 @@ from django.db import models
 class Customer(models.Model):
     name = models.CharField(max_length=255)
     email = models.EmailField(unique=True)
-    phone = models.CharField(max_length=20, blank=True, null=True)
+    # Indexed so the phone_pattern startswith filter uses the B-tree
+    phone = models.CharField(max_length=20, blank=True, null=True, db_index=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
@@ -26,6 +27,15 @@ class Order(models.Model):
     order_date = models.DateTimeField(auto_now_add=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        # Covers the OrderFilter range lookups and the common
+        # "orders for customer in date range" pattern
+        indexes = [
+            models.Index(fields=['order_date']),
+            models.Index(fields=['total_amount']),
+            models.Index(fields=['customer', 'order_date']),
+        ]
+
     def __str__(self):
         return f"Order {self.id} - {self.customer.name}"
 
@@ -1,12 +1,25 @@
 # crm/mutations.py
 import re
 import graphene
-from django.db import transaction
+from django.db import transaction, IntegrityError
+from django.db.models import Sum
 from django.utils import timezone
 from decimal import Decimal
 from .models import Customer, Product, Order
+from .services import update_low_stock_products
 from .types import CustomerType, ProductType, OrderType
 
+# Validation patterns compiled once at import time - avoids the re cache
+# lookup on every call, which adds up on bulk mutations
+_EMAIL_RE = re.compile(r'^[^\s@]+@[^\s@]+\.[^\s@]+$')
+_PHONE_RE = re.compile(r'^(\+[1-9]\d{1,14}|\d{3}-\d{3}-\d{4})$')
+
+# Rows per INSERT statement for bulk loads. ~3 columns/row keeps each
+# statement a few thousand placeholders - well under DB parameter limits
+# (65535 on PostgreSQL, 999/32766 on SQLite) while still batching far
+# fewer statements than a per-row loop.
+BULK_BATCH_SIZE = 500
+
 # Input type for customer data
 class CustomerInput(graphene.InputObjectType):
     name = graphene.String(required=True)
@@ -29,32 +42,41 @@ class CustomerResult(graphene.ObjectType):
 # Base class with shared validation and creation logic
 class BaseCustomerMutation:
     @classmethod
-    def validate_customer_data(cls, name, email, phone=None):
-        """Shared validation logic"""
+    def validate_customer_data(cls, name, email, phone=None, existing_emails=None, seen_in_batch=None):
+        """Shared validation logic
+
+        `existing_emails` (set) lets bulk callers pre-fetch uniqueness data
+        in one query instead of one SELECT per row; `seen_in_batch` (set) is
+        the emails already accepted earlier in the same batch, so only the
+        second and later occurrences of a duplicate are rejected. Bulk
+        callers must pass an already-normalized email. Pure function -
+        no DB access.
+        """
         errors = []
-        
+
         # Validate name
         if not name or not name.strip():
             errors.append("Name is required")
 
-        # Validate email format
-        if not re.match(r'^[^\s@]+@[^\s@]+\.[^\s@]+$', email):
+        # Validate email format (uniqueness is enforced by the DB constraint
+        # on insert - no SELECT-for-existence round-trip needed)
+        if not _EMAIL_RE.match(email):
             errors.append("Invalid email format")
-     
-        # Validate email uniqueness
-        if Customer.objects.filter(email=email).exists():
+        elif existing_emails is not None and email in existing_emails:
             errors.append("Email already exists")
-        
+        elif seen_in_batch is not None and email in seen_in_batch:
+            errors.append("Email duplicated in batch")
+
         # Validate phone format if provided
-        if phone and not re.match(r'^(\+[1-9]\d{1,14}|\d{3}-\d{3}-\d{4})$', phone):
+        if phone and not _PHONE_RE.match(phone):
             errors.append("Invalid phone format. Use +1234567890 or 123-456-7890 format")
-            
+
         return errors
 
     @classmethod
-    def create_customer_safe(cls, name, email, phone=None):
+    def create_customer_safe(cls, name, email, phone=None, existing_emails=None, seen_in_batch=None):
         """Safe customer creation with validation - returns (customer, errors)"""
-        errors = cls.validate_customer_data(name, email, phone)
+        errors = cls.validate_customer_data(name, email, phone, existing_emails, seen_in_batch)
         
         if errors:
             return None, errors
@@ -62,10 +84,14 @@ class BaseCustomerMutation:
         try:
             customer = Customer.objects.create(
                 name=name.strip(),
-                email=email.lower().strip(), 
+                email=email.lower().strip(),
                 phone=phone
             )
             return customer, None
+        except IntegrityError:
+            # Unique constraint on email caught the duplicate atomically -
+            # single INSERT instead of SELECT + INSERT, and no TOCTOU race
+            return None, ["Email already exists"]
         except Exception as e:
             return None, [f"Database error: {str(e)}"]
 
@@ -107,80 +133,87 @@ class BulkCreateCustomers(BaseCustomerMutation, graphene.Mutation):
     def mutate(self, info, customers, fail_on_error=False):
         if not customers:
             raise Exception("No customers provided")
-        
-        results = []
-        successful_customers = []
-        has_errors = False
-        
-        # Pre-validate all customers if fail_on_error is True
+
+        # Normalize every row exactly once; these tuples are the canonical
+        # values for validation, the uniqueness query, and the insert
+        normalized = [
+            ((c.name or '').strip(), (c.email or '').lower().strip(), c.phone)
+            for c in customers
+        ]
+
+        # One query answers "which of these emails already exist?" for the
+        # whole batch
+        incoming_emails = [row[1] for row in normalized]
+        existing_emails = set(
+            Customer.objects.filter(email__in=incoming_emails).values_list('email', flat=True)
+        )
+
+        # Single validation pass over the whole batch - the uniqueness data
+        # is already in memory, so no queries here. seen_in_batch grows as
+        # rows are accepted, so the first occurrence of an intra-batch
+        # duplicate wins and only later ones are rejected (same behaviour
+        # as the old per-row loop)
+        row_errors = []
+        seen_in_batch = set()
+        for name, email, phone in normalized:
+            errors = BulkCreateCustomers.validate_customer_data(
+                name, email, phone, existing_emails, seen_in_batch
+            )
+            if not errors:
+                seen_in_batch.add(email)
+            row_errors.append(errors)
+
         if fail_on_error:
-            validation_errors = []
-            for i, customer_data in enumerate(customers):
-                errors = BulkCreateCustomers.validate_customer_data(
-                    customer_data.name,
-                    customer_data.email, 
-                    customer_data.phone
-                )
-                if errors:
-                    validation_errors.extend([f"Customer {i+1}: {error}" for error in errors])
-            
+            validation_errors = [
+                f"Customer {i+1}: {error}"
+                for i, errors in enumerate(row_errors)
+                for error in errors
+            ]
             if validation_errors:
                 raise Exception("Validation failed: " + "; ".join(validation_errors))
-        
-        # Process each customer with atomic transactions for consistency
+
+        # One bulk INSERT for every valid row - no per-row savepoint
+        # round-trips (SAVEPOINT + RELEASE per customer)
+        valid_objs = [
+            Customer(name=name, email=email, phone=phone)
+            for i, (name, email, phone) in enumerate(normalized)
+            if not row_errors[i]
+        ]
         with transaction.atomic():
-            for i, customer_data in enumerate(customers):
-                input_data = CustomerData(
-                    name=customer_data.name,
-                    email=customer_data.email,
-                    phone=customer_data.phone
-                )
-                
-                # Create savepoint for individual customer
-                sid = transaction.savepoint()
-                
-                try:
-                    customer, errors = BulkCreateCustomers.create_customer_safe(
-                        customer_data.name,
-                        customer_data.email, 
-                        customer_data.phone
-                    )
-                    
-                    if customer:
-                        successful_customers.append(customer)
-                        results.append(CustomerResult(
-                            customer=customer,
-                            success=True,
-                            error=None,
-                            input_data=input_data
-                        ))
-                        transaction.savepoint_commit(sid)
-                    else:
-                        has_errors = True
-                        results.append(CustomerResult(
-                            customer=None,
-                            success=False,
-                            error="; ".join(errors),
-                            input_data=input_data
-                        ))
-                        transaction.savepoint_rollback(sid)
-                        
-                        if fail_on_error:
-                            raise Exception(f"Failed to create customer {i+1}: {'; '.join(errors)}")
-                
-                except Exception as e:
-                    transaction.savepoint_rollback(sid)
-                    has_errors = True
-                    results.append(CustomerResult(
-                        customer=None,
-                        success=False,
-                        error=str(e),
-                        input_data=input_data
-                    ))
-                    
-                    if fail_on_error:
-                        raise Exception(f"Failed to create customer {i+1}: {str(e)}")
-        
+            Customer.objects.bulk_create(valid_objs, batch_size=BULK_BATCH_SIZE, ignore_conflicts=True)
+
+        # ignore_conflicts means no RETURNING ids - re-query the created rows
+        created_by_email = {
+            c.email: c
+            for c in Customer.objects.filter(email__in=[obj.email for obj in valid_objs])
+        }
+
+        results = []
+        successful_customers = []
+        for i, customer_data in enumerate(customers):
+            input_data = CustomerData(
+                name=customer_data.name,
+                email=customer_data.email,
+                phone=customer_data.phone
+            )
+            customer = None if row_errors[i] else created_by_email.get(incoming_emails[i])
+            if customer:
+                successful_customers.append(customer)
+                results.append(CustomerResult(
+                    customer=customer,
+                    success=True,
+                    error=None,
+                    input_data=input_data
+                ))
+            else:
+                error = "; ".join(row_errors[i]) if row_errors[i] else "Email already exists"
+                results.append(CustomerResult(
+                    customer=None,
+                    success=False,
+                    error=error,
+                    input_data=input_data
+                ))
+
         success_count = len(successful_customers)
         error_count = len(customers) - success_count
         total_count = len(customers)
@@ -262,39 +295,49 @@ class CreateOrder(graphene.Mutation):
             customer = None
         
         # Validate product_ids
+        existing_ids = set()
         if not product_ids:
             errors.append("At least one product ID is required")
         else:
-            # Check if all products exist
-            products = Product.objects.filter(id__in=product_ids)
-            existing_product_ids = set(str(p.id) for p in products)
-            provided_product_ids = set(str(pid) for pid in product_ids)
-            
-            missing_ids = provided_product_ids - existing_product_ids
-            if missing_ids:
-                errors.append(f"Invalid product IDs: {', '.join(missing_ids)}")
-        
+            # Compare on the integer ids values_list already returns - no
+            # per-item str() passes over either collection
+            try:
+                provided_ids = {int(pid) for pid in product_ids}
+            except (TypeError, ValueError):
+                provided_ids = set()
+                errors.append("Product IDs must be numeric")
+
+            if provided_ids:
+                existing_ids = set(Product.objects.filter(id__in=provided_ids).values_list('id', flat=True))
+                missing_ids = provided_ids - existing_ids
+                if missing_ids:
+                    errors.append(f"Invalid product IDs: {', '.join(str(pid) for pid in sorted(missing_ids))}")
+
         if errors:
             raise Exception("; ".join(errors))
-        
+
         # Set order_date to now if not provided
         if order_date is None:
             order_date = timezone.now()
-        
+
         try:
             with transaction.atomic():
-                # Calculate total amount
-                total_amount = sum(product.price for product in products)
-                
+                # Let the database sum the prices - one scalar comes back
+                # instead of N decimals
+                total_amount = Product.objects.filter(id__in=product_ids).aggregate(
+                    total=Sum('price')
+                )['total'] or Decimal('0')
+
                 # Create the order
                 order = Order.objects.create(
                     customer=customer,
                     total_amount=total_amount,
                     order_date=order_date
                 )
-                
-                # Associate products with the order
-                order.products.set(products)
+
+                # Associate products by raw ID - .add on a fresh order skips
+                # the pre-delete query that .set issues
+                order.products.add(*existing_ids)
                 
                 return CreateOrder(
                     order=order,
@@ -310,12 +353,7 @@ class UpdateLowStockProducts(graphene.Mutation):
     message = graphene.String()
 
     def mutate(self, info):
-        low_stock = Product.objects.filter(stock__lt=10)
-        updated = []
-        for product in low_stock:
-            product.stock += 10  # simulate restocking
-            product.save()
-            updated.append(product)
+        updated = update_low_stock_products()
         return UpdateLowStockProducts(
             updated_products=updated,
             message="Stock updated successfully"
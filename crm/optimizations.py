@@ -0,0 +1,144 @@
+# crm/optimizations.py
+import re
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from django.db.models.fields.related import ForeignKey, OneToOneField
+from graphene_django.filter import DjangoFilterConnectionField
+from graphql.language import FragmentSpreadNode, InlineFragmentNode
+
+from .utils import cached_count_queryset
+
+# Matches positions before uppercase letters for camelCase -> snake_case
+_CAMEL_RE = re.compile(r'(?<!^)(?=[A-Z])')
+
+# Relay connection wrapper fields - descend through these without mapping to model fields
+_CONNECTION_WRAPPERS = {'edges', 'node'}
+
+
+def _to_snake(name):
+    """Convert a GraphQL camelCase field name to a Django snake_case field name"""
+    return _CAMEL_RE.sub('_', name).lower()
+
+
+def _iter_selections(selection_set, fragments):
+    """Yield (field_name, sub_selection_set) pairs
+
+    Flattens relay edges/node wrappers, expands named fragment spreads via
+    `fragments` (info.fragments), and descends into inline fragments.
+    """
+    for selection in selection_set.selections:
+        if isinstance(selection, FragmentSpreadNode):
+            fragment = (fragments or {}).get(selection.name.value)
+            if fragment:
+                yield from _iter_selections(fragment.selection_set, fragments)
+            continue
+        if isinstance(selection, InlineFragmentNode):
+            yield from _iter_selections(selection.selection_set, fragments)
+            continue
+        name = getattr(getattr(selection, 'name', None), 'value', None)
+        if name is None:
+            continue
+        if name in _CONNECTION_WRAPPERS and selection.selection_set:
+            yield from _iter_selections(selection.selection_set, fragments)
+        else:
+            yield name, selection.selection_set
+
+
+def _apply_plan(queryset, select, prefetch, only):
+    """Apply a planned select/prefetch/only combination to `queryset`"""
+    if select:
+        queryset = queryset.select_related(*select)
+    if prefetch:
+        queryset = queryset.prefetch_related(*prefetch)
+    if only:
+        queryset = queryset.only(*only)
+    return queryset
+
+
+def _build_lookups(model, selection_set, fragments, prefix=''):
+    """
+    Walk the GraphQL selection set against the model meta and collect
+    select_related paths (FK/O2O), prefetch_related lookups (M2M/reverse FK,
+    as Prefetch objects carrying narrowed inner querysets), and the scalar
+    columns actually selected (for .only() projection)
+    """
+    select = []
+    prefetch = []
+    # pk is always loaded by Django, but listing it keeps the projection explicit
+    only = [f"{prefix}id"]
+
+    for name, sub_selection in _iter_selections(selection_set, fragments):
+        field_name = _to_snake(name)
+        try:
+            field = model._meta.get_field(field_name)
+        except FieldDoesNotExist:
+            continue
+
+        path = f"{prefix}{field_name}"
+
+        if not field.is_relation:
+            only.append(path)
+            continue
+
+        if isinstance(field, (ForeignKey, OneToOneField)):
+            select.append(path)
+            if sub_selection:
+                nested_select, nested_prefetch, nested_only = _build_lookups(
+                    field.related_model, sub_selection, fragments, prefix=f"{path}__"
+                )
+                select.extend(nested_select)
+                prefetch.extend(nested_prefetch)
+                # .only() paths may follow select_related joins
+                only.extend(nested_only)
+        elif sub_selection:
+            # ManyToMany or reverse relation - prefetch with an inner queryset
+            # that is itself planned (joins + projection) from the nested AST
+            inner_select, inner_prefetch, inner_only = _build_lookups(
+                field.related_model, sub_selection, fragments
+            )
+            if field.one_to_many:
+                # Reverse FK: the join column must survive the projection or
+                # every prefetched row triggers a deferred load
+                inner_only.append(field.field.name)
+            inner = _apply_plan(
+                field.related_model._default_manager.all(),
+                inner_select, inner_prefetch, inner_only
+            )
+            prefetch.append(Prefetch(path, queryset=inner))
+        else:
+            prefetch.append(path)
+
+    return select, prefetch, only
+
+
+def optimize_queryset(queryset, info):
+    """
+    Inspect the GraphQL selection set in `info` and inject select_related /
+    prefetch_related plus an .only() projection, so related objects load in
+    O(1) extra queries and only the selected columns cross the wire.
+    Safe to call from any resolver.
+    """
+    field_nodes = getattr(info, 'field_nodes', None)
+    if not field_nodes or not field_nodes[0].selection_set:
+        return queryset
+
+    fragments = getattr(info, 'fragments', None)
+    select, prefetch, only = _build_lookups(
+        queryset.model, field_nodes[0].selection_set, fragments
+    )
+    return _apply_plan(queryset, select, prefetch, only)
+
+
+class OptimizedFilterConnectionField(DjangoFilterConnectionField):
+    """DjangoFilterConnectionField that optimizes the queryset after filtering
+
+    Also caches the pagination COUNT(*) per filtered-queryset SQL, so
+    walking pages doesn't rescan the table for every request.
+    """
+
+    @classmethod
+    def resolve_queryset(cls, connection, iterable, info, args, filtering_args, filterset_class):
+        queryset = super().resolve_queryset(
+            connection, iterable, info, args, filtering_args, filterset_class
+        )
+        return cached_count_queryset(optimize_queryset(queryset, info))
@@ -1,9 +1,12 @@
 # crm/schema.py
 import graphene
 import datetime
+from decimal import Decimal
+from django.db.models import Sum
 from django.utils import timezone
-from graphene_django.filter import DjangoFilterConnectionField
+from graphene_django import DjangoListField
 from .mutations import CreateCustomer, BulkCreateCustomers, CreateProduct, CreateOrder, UpdateLowStockProducts
+from .optimizations import optimize_queryset, OptimizedFilterConnectionField
 from .types import CustomerType, ProductType, OrderType
 from .models import Customer, Product, Order
 from .filters import CustomerFilter, ProductFilter, OrderFilter
@@ -34,6 +37,89 @@ class OrderFilterInput(graphene.InputObjectType):
     product_name = graphene.String()
     product_id = graphene.ID()
 
+# Input-field -> ORM-lookup maps for the custom filtered resolvers; one
+# .filter(**kwargs) call instead of a clone-per-condition if-ladder
+CUSTOMER_FIELD_MAP = {
+    'name_icontains': 'name__icontains',
+    'email_icontains': 'email__icontains',
+    'created_at_gte': 'created_at__gte',
+    'created_at_lte': 'created_at__lte',
+    'phone_pattern': 'phone__startswith',
+}
+
+PRODUCT_FIELD_MAP = {
+    'name_icontains': 'name__icontains',
+    'price_gte': 'price__gte',
+    'price_lte': 'price__lte',
+    'stock_gte': 'stock__gte',
+    'stock_lte': 'stock__lte',
+}
+
+ORDER_FIELD_MAP = {
+    'total_amount_gte': 'total_amount__gte',
+    'total_amount_lte': 'total_amount__lte',
+    'order_date_gte': 'order_date__gte',
+    'order_date_lte': 'order_date__lte',
+    'customer_name': 'customer__name__icontains',
+    'product_name': 'products__name__icontains',
+    'product_id': 'products__id',
+}
+
+# Sliding-window span for the last-7-days resolvers, built once at import
+_SEVEN_DAYS = datetime.timedelta(days=7)
+
+# Only filters joining through the products M2M can duplicate order rows
+# and therefore need DISTINCT
+ORDER_DISTINCT_KEYS = frozenset({'product_name', 'product_id'})
+
+def _order_allowlist(*fields):
+    """Build the set of permitted order_by values (each field, both directions)"""
+    return frozenset(f for field in fields for f in (field, f'-{field}'))
+
+# order_by is user-controlled; anything outside these indexed/known columns
+# falls back to pk ordering instead of triggering an arbitrary filesort
+CUSTOMER_ORDER_ALLOWLIST = _order_allowlist('id', 'name', 'email', 'created_at')
+PRODUCT_ORDER_ALLOWLIST = _order_allowlist('id', 'name', 'price', 'stock', 'created_at')
+ORDER_ORDER_ALLOWLIST = _order_allowlist('id', 'total_amount', 'order_date', 'created_at')
+
+def _low_stock_extra(f, kwargs):
+    # low_stock needs a computed lookup; False now means "not low"
+    # instead of being silently dropped
+    low_stock = f.get('low_stock')
+    if low_stock is True:
+        kwargs['stock__lt'] = 10
+    elif low_stock is False:
+        kwargs['stock__gte'] = 10
+
+def make_filter_resolver(model, field_map, order_allowlist,
+                         distinct_keys=frozenset(), apply_extra=None):
+    """Compile a *_filtered resolver closure at import time
+
+    The field map, ordering allowlist and distinct-key set are frozen into
+    the closure's cells, so per-request work is one dict comprehension and
+    one filter() call with no per-model dispatch.
+    """
+    def resolver(self, info, filter=None, order_by="id"):
+        queryset = optimize_queryset(model.objects.all(), info)
+        f = dict(filter) if filter else {}
+        kwargs = {
+            field_map[key]: value
+            for key, value in f.items()
+            if value is not None and key in field_map
+        }
+        if apply_extra is not None:
+            apply_extra(f, kwargs)
+        if kwargs:
+            queryset = queryset.filter(**kwargs)
+        # DISTINCT sorts and uniquifies every row - only pay for it when
+        # a multi-valued join could actually produce duplicates
+        if distinct_keys and distinct_keys & f.keys():
+            queryset = queryset.distinct()
+        if order_by not in order_allowlist:
+            order_by = 'id'
+        return queryset.order_by(order_by)
+    return resolver
+
 # Connection classes for relay-style pagination
 class CustomerConnection(graphene.relay.Connection):
     class Meta:
@@ -51,10 +137,12 @@ class Query(graphene.ObjectType):
     # Simple hello field
     hello = graphene.String(default_value="Hello World!")
     
-    # Basic queries without filters
-    all_customers = graphene.List(CustomerType)
-    all_products = graphene.List(ProductType)
-    all_orders = graphene.List(OrderType)
+    # Basic queries without filters - DjangoListField instead of a plain
+    # graphene.List, with optimizer-backed resolvers below (use filtered_*
+    # when pagination is needed)
+    all_customers = DjangoListField(CustomerType)
+    all_products = DjangoListField(ProductType)
+    all_orders = DjangoListField(OrderType)
     
     # Individual item queries
     customer = graphene.Field(CustomerType, id=graphene.ID())
@@ -62,9 +150,9 @@ class Query(graphene.ObjectType):
     order = graphene.Field(OrderType, id=graphene.ID())
     
     # Filtered queries with Django Filter Connection Fields
-    filtered_customers = DjangoFilterConnectionField(CustomerType, filterset_class=CustomerFilter)
-    filtered_products = DjangoFilterConnectionField(ProductType, filterset_class=ProductFilter)
-    filtered_orders = DjangoFilterConnectionField(OrderType, filterset_class=OrderFilter)
+    filtered_customers = OptimizedFilterConnectionField(CustomerType, filterset_class=CustomerFilter)
+    filtered_products = OptimizedFilterConnectionField(ProductType, filterset_class=ProductFilter)
+    filtered_orders = OptimizedFilterConnectionField(OrderType, filterset_class=OrderFilter)
     
     # Custom filtered queries with ordering support
     customers_filtered = graphene.List(
@@ -86,93 +174,55 @@ class Query(graphene.ObjectType):
     )
 
     def resolve_all_customers(self, info):
-        return Customer.objects.all()
+        # optimize_queryset reads the selection set and injects the needed
+        # select_related/prefetch_related, so nested traversal avoids N+1 queries
+        return optimize_queryset(Customer.objects.all(), info)
 
     def resolve_all_products(self, info):
-        return Product.objects.all()
+        return optimize_queryset(Product.objects.all(), info)
 
     def resolve_all_orders(self, info):
-        return Order.objects.all()
+        return optimize_queryset(Order.objects.all(), info)
 
     def resolve_customer(self, info, id):
-        try:
-            return Customer.objects.get(id=id)
-        except Customer.DoesNotExist:
-            return None
+        # .first() maps a missing row to None without the exception
+        # setup/teardown of try/except DoesNotExist
+        return optimize_queryset(Customer.objects.all(), info).filter(pk=id).first()
 
     def resolve_product(self, info, id):
-        try:
-            return Product.objects.get(id=id)
-        except Product.DoesNotExist:
-            return None
+        return optimize_queryset(Product.objects.all(), info).filter(pk=id).first()
 
     def resolve_order(self, info, id):
-        try:
-            return Order.objects.get(id=id)
-        except Order.DoesNotExist:
-            return None
-
-    def resolve_customers_filtered(self, info, filter=None, order_by="id"):
-        queryset = Customer.objects.all()
-        
-        if filter:
-            if filter.get('name_icontains'):
-                queryset = queryset.filter(name__icontains=filter['name_icontains'])
-            if filter.get('email_icontains'):
-                queryset = queryset.filter(email__icontains=filter['email_icontains'])
-            if filter.get('created_at_gte'):
-                queryset = queryset.filter(created_at__gte=filter['created_at_gte'])
-            if filter.get('created_at_lte'):
-                queryset = queryset.filter(created_at__lte=filter['created_at_lte'])
-            if filter.get('phone_pattern'):
-                queryset = queryset.filter(phone__startswith=filter['phone_pattern'])
-        
-        return queryset.order_by(order_by)
-
-    def resolve_products_filtered(self, info, filter=None, order_by="id"):
-        queryset = Product.objects.all()
-        
-        if filter:
-            if filter.get('name_icontains'):
-                queryset = queryset.filter(name__icontains=filter['name_icontains'])
-            if filter.get('price_gte'):
-                queryset = queryset.filter(price__gte=filter['price_gte'])
-            if filter.get('price_lte'):
-                queryset = queryset.filter(price__lte=filter['price_lte'])
-            if filter.get('stock_gte'):
-                queryset = queryset.filter(stock__gte=filter['stock_gte'])
-            if filter.get('stock_lte'):
-                queryset = queryset.filter(stock__lte=filter['stock_lte'])
-            if filter.get('low_stock'):
-                queryset = queryset.filter(stock__lt=10)
-        
-        return queryset.order_by(order_by)
-
-    def resolve_orders_filtered(self, info, filter=None, order_by="id"):
-        queryset = Order.objects.all()
-        
-        if filter:
-            if filter.get('total_amount_gte'):
-                queryset = queryset.filter(total_amount__gte=filter['total_amount_gte'])
-            if filter.get('total_amount_lte'):
-                queryset = queryset.filter(total_amount__lte=filter['total_amount_lte'])
-            if filter.get('order_date_gte'):
-                queryset = queryset.filter(order_date__gte=filter['order_date_gte'])
-            if filter.get('order_date_lte'):
-                queryset = queryset.filter(order_date__lte=filter['order_date_lte'])
-            if filter.get('customer_name'):
-                queryset = queryset.filter(customer__name__icontains=filter['customer_name'])
-            if filter.get('product_name'):
-                queryset = queryset.filter(products__name__icontains=filter['product_name'])
-            if filter.get('product_id'):
-                queryset = queryset.filter(products__id=filter['product_id'])
-        
-        return queryset.distinct().order_by(order_by)
+        return optimize_queryset(Order.objects.all(), info).filter(pk=id).first()
+
+    # Compiled once at schema build - each closure carries its field map,
+    # allowlist and extras in cells rather than re-dispatching per request
+    resolve_customers_filtered = make_filter_resolver(
+        Customer, CUSTOMER_FIELD_MAP, CUSTOMER_ORDER_ALLOWLIST)
+    resolve_products_filtered = make_filter_resolver(
+        Product, PRODUCT_FIELD_MAP, PRODUCT_ORDER_ALLOWLIST,
+        apply_extra=_low_stock_extra)
+    resolve_orders_filtered = make_filter_resolver(
+        Order, ORDER_FIELD_MAP, ORDER_ORDER_ALLOWLIST,
+        distinct_keys=ORDER_DISTINCT_KEYS)
     
     orders_last7days = graphene.List(OrderType)
     def resolve_orders_last7days(self, info):
-        cutoff = timezone.now() - datetime.timedelta(days=7)
-        return Order.objects.filter(order_date__gte=cutoff)
+        # order_date is indexed (see Order.Meta), so the range filter and
+        # the newest-first ordering both ride the same B-tree
+        cutoff = timezone.now() - _SEVEN_DAYS
+        return optimize_queryset(
+            Order.objects.filter(order_date__gte=cutoff), info
+        ).order_by('-order_date')
+
+    orders_last7days_revenue = graphene.Decimal()
+    def resolve_orders_last7days_revenue(self, info):
+        # Consumers that only want the revenue skip row transfer entirely
+        cutoff = timezone.now() - _SEVEN_DAYS
+        total = Order.objects.filter(order_date__gte=cutoff).aggregate(
+            total=Sum('total_amount')
+        )['total']
+        return total if total is not None else Decimal('0')
 
 
 class Mutation(graphene.ObjectType):
@@ -0,0 +1,32 @@
+# crm/services.py
+import datetime
+from django.db import transaction
+from django.utils import timezone
+from .models import Product, Order
+
+LOW_STOCK_THRESHOLD = 10
+RESTOCK_INCREMENT = 10
+
+
+def update_low_stock_products():
+    """Restock products under the low-stock threshold
+
+    Core logic shared by the UpdateLowStockProducts mutation and the cron
+    job, so in-process callers skip the HTTP/GraphQL round-trip entirely.
+    Returns the list of updated products.
+    """
+    with transaction.atomic():
+        # Only the columns the restock and its logging need
+        low_stock = list(
+            Product.objects.filter(stock__lt=LOW_STOCK_THRESHOLD).only('id', 'name', 'stock')
+        )
+        for product in low_stock:
+            product.stock += RESTOCK_INCREMENT  # simulate restocking
+            product.save()
+    return low_stock
+
+
+def recent_order_reminders(days=7):
+    """Return (order_id, customer_email) pairs for orders in the last `days`"""
+    cutoff = timezone.now() - datetime.timedelta(days=days)
+    return Order.objects.filter(order_date__gte=cutoff).values_list('id', 'customer__email')
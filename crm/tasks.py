@@ -1,26 +1,53 @@
-import datetime, requests
-# from datetime import datetime
-# import requests
-from celery import shared_task
+import atexit
+import os
+
+from celery import group, shared_task
+from django.db.models import Count, Sum
+from django.utils import timezone
+
+from crm.models import Customer, Order
+
+# Opened once per worker; O_APPEND makes each os.write an atomic append
+# even with concurrent workers sharing the file
+_LOG_FD = os.open('/tmp/crm_report_log.txt', os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+atexit.register(os.close, _LOG_FD)
 
 @shared_task
 def generate_crm_report():
-    endpoint = "http://localhost:8000/graphql"
-    query = """
-    query {
-      allCustomers { id }
-      allOrders { id totalAmount }
-    }
-    """
-    response = requests.post(endpoint, json={"query": query})
-    data = response.json().get("data", {})
-
-    customers = data.get("allCustomers", [])
-    orders = data.get("allOrders", [])
-    total_customers = len(customers)
-    total_orders = len(orders)
-    total_revenue = sum([float(o["totalAmount"]) for o in orders if o.get("totalAmount")])
-
-    timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    with open("/tmp/crm_report_log.txt", "a") as f:
-        f.write(f"{timestamp} - Report: {total_customers} customers, {total_orders} orders, {total_revenue} revenue\n")
+    # Same process as the GraphQL server, so aggregate straight through the
+    # ORM - no HTTP hop, no JSON decode, and the sum runs in the database
+    totals = Order.objects.aggregate(n=Count('id'), rev=Sum('total_amount'))
+    total_customers = Customer.objects.count()
+    total_orders = totals['n']
+    total_revenue = float(totals['rev'] or 0)
+
+    timestamp = timezone.now().strftime("%Y-%m-%d %H:%M:%S")
+    os.write(
+        _LOG_FD,
+        f"{timestamp} - Report: {total_customers} customers, {total_orders} orders, {total_revenue} revenue\n".encode()
+    )
+
+
+@shared_task
+def generate_customer_report(customer_id):
+    # One aggregate query per customer; the heavy lifting stays in the database
+    totals = Order.objects.filter(customer_id=customer_id).aggregate(
+        n=Count('id'), rev=Sum('total_amount')
+    )
+    timestamp = timezone.now().strftime("%Y-%m-%d %H:%M:%S")
+    os.write(
+        _LOG_FD,
+        f"{timestamp} - Customer {customer_id}: {totals['n']} orders, {float(totals['rev'] or 0)} revenue\n".encode()
+    )
+
+
+@shared_task
+def generate_all_reports():
+    # Enqueue every per-customer report through one group() rather than a
+    # .delay() per id - celery + redis-py pipeline the whole batch into a
+    # handful of round-trips to the broker. iterator() streams the ids so
+    # the full customer table is never held in memory at once.
+    group(
+        generate_customer_report.s(customer_id)
+        for customer_id in Customer.objects.values_list('id', flat=True).iterator()
+    ).apply_async()
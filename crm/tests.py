@@ -1,3 +1,71 @@
-from django.test import TestCase
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
 
-# Create your tests here.
+from .management.commands.dump_schema import SCHEMA_SDL_PATH
+from .models import Customer, Product, Order
+from .schema import schema
+
+
+class QueryCountTests(TestCase):
+    """Lock in the resolver query plans
+
+    The optimizer turns nested order traversal into a constant number of
+    queries regardless of row count; a failure here means an N+1 crept
+    back into a resolver.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        products = [
+            Product.objects.create(name=f'Product {i}', price=10, stock=20)
+            for i in range(3)
+        ]
+        for i in range(5):
+            customer = Customer.objects.create(name=f'Customer {i}', email=f'c{i}@example.com')
+            order = Order.objects.create(customer=customer, total_amount=30)
+            order.products.set(products)
+
+    def setUp(self):
+        # cachalot and the cached COUNT(*) both live in the default cache;
+        # start every test cold so assertNumQueries counts real queries
+        cache.clear()
+
+    def execute(self, query):
+        result = schema.execute(query)
+        self.assertIsNone(result.errors, result.errors)
+        return result.data
+
+    def test_all_orders_nested_runs_constant_queries(self):
+        # One orders query with the customer join, one batched products
+        # prefetch - independent of how many orders exist
+        with self.assertNumQueries(2):
+            data = self.execute(
+                '{ allOrders { id customer { name email } '
+                'products { edges { node { name price } } } } }'
+            )
+        self.assertEqual(len(data['allOrders']), 5)
+        for order in data['allOrders']:
+            self.assertEqual(len(order['products']['edges']), 3)
+
+    def test_filtered_orders_page_runs_constant_queries(self):
+        # One COUNT(*) for pagination, one page query with the customer
+        # join, one batched products prefetch
+        with self.assertNumQueries(3):
+            data = self.execute(
+                '{ filteredOrders(first: 3) { edges { node { id '
+                'customer { name } products { edges { node { name } } } } } } }'
+            )
+        self.assertEqual(len(data['filteredOrders']['edges']), 3)
+
+
+class SchemaSnapshotTests(SimpleTestCase):
+    """Guard the committed SDL snapshot against drift"""
+
+    def test_sdl_snapshot_matches_live_schema(self):
+        # Fails when the schema changes without re-running dump_schema
+        with open(SCHEMA_SDL_PATH) as f:
+            snapshot = f.read()
+        self.assertEqual(
+            snapshot, str(schema) + '\n',
+            "crm/schema.graphql is stale - run `manage.py dump_schema`"
+        )
@@ -1,18 +1,49 @@
 # crm/types.py
+import graphene
 from graphene_django import DjangoObjectType
 from .models import Customer, Product, Order
 
+# Note: the AST optimizer is applied in the Query resolvers and in
+# OptimizedFilterConnectionField rather than via a get_queryset override
+# here - graphene-django 3.2 routes FK fields through get_node whenever
+# get_queryset is overridden, which re-queries rows that select_related
+# already joined and would reintroduce the N+1.
+
+# Exposed columns per type - the single source for Meta.fields and for
+# callers that want a static .only() projection matching the GraphQL API
+CUSTOMER_FIELDS = ('id', 'name', 'email', 'phone', 'created_at')
+PRODUCT_FIELDS = ('id', 'name', 'price', 'stock', 'created_at')
+ORDER_FIELDS = ('id', 'customer', 'products', 'total_amount', 'order_date', 'created_at')
+
 class CustomerType(DjangoObjectType):
     class Meta:
         model = Customer
-        fields = ('id', 'name', 'email', 'phone', 'created_at')
+        fields = CUSTOMER_FIELDS
+        interfaces = (graphene.relay.Node,)
 
 class ProductType(DjangoObjectType):
     class Meta:
         model = Product
-        fields = ('id', 'name', 'price', 'stock', 'created_at')
+        fields = PRODUCT_FIELDS
+        interfaces = (graphene.relay.Node,)
 
 class OrderType(DjangoObjectType):
     class Meta:
         model = Order
-        fields = ('id', 'customer', 'products', 'total_amount', 'order_date', 'created_at')
\ No newline at end of file
+        fields = ORDER_FIELDS
+        interfaces = (graphene.relay.Node,)
+
+    def resolve_customer(self, info):
+        # Under async execution a per-request DataLoader batches the FK
+        # lookups; without one (sync view), fall back to the FK attribute,
+        # which select_related has usually already populated
+        loader = getattr(info.context, 'customer_loader', None)
+        if loader is not None:
+            return loader.load(self.customer_id)
+        return self.customer
+
+    def resolve_products(self, info):
+        loader = getattr(info.context, 'products_by_order_loader', None)
+        if loader is not None:
+            return loader.load(self.id)
+        return self.products.all()
\ No newline at end of file
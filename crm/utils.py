@@ -0,0 +1,28 @@
+# crm/utils.py
+import hashlib
+from django.core.cache import cache
+
+# How long a paginated connection reuses one COUNT(*) result
+COUNT_CACHE_TTL = 60
+
+
+def cached_count_queryset(queryset, ttl=COUNT_CACHE_TTL):
+    """Wrap queryset.count() with a short-TTL cache keyed on its SQL
+
+    Relay connections re-issue COUNT(*) for every page; walking pages of
+    the same filtered queryset can reuse one count for `ttl` seconds.
+    Returns a clone so the original queryset keeps its real count().
+    """
+    queryset = queryset._chain()
+    real_count = queryset.count
+
+    def count():
+        key = 'qs-count:' + hashlib.md5(str(queryset.query).encode()).hexdigest()
+        value = cache.get(key)
+        if value is None:
+            value = real_count()
+            cache.set(key, value, ttl)
+        return value
+
+    queryset.count = count
+    return queryset
@@ -45,6 +45,7 @@ INSTALLED_APPS = [
     'graphene_django',
     'django_filters',
     'django_crontab',
+    'cachalot',
 
     # Local apps
     'crm',
@@ -134,9 +135,21 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # GraphQL Configuration
 GRAPHENE = {
-    'SCHEMA': 'crm.schema.schema'
+    'SCHEMA': 'crm.schema.schema',
+    # Attaches per-request DataLoaders under async execution; sync requests
+    # fall back to the resolver-level select_related/prefetch plan
+    'MIDDLEWARE': [
+        'crm.loaders.LoaderMiddleware',
+    ],
 }
 
+# ORM query cache (django-cachalot) - caches SELECT results keyed per table
+# and invalidates automatically on writes to the involved tables. Uses the
+# default cache backend (locmem here; point CACHES at Redis in production
+# so invalidation is shared across workers).
+CACHALOT_ENABLED = True
+CACHALOT_CACHE = 'default'
+
 CRONJOBS = [
     ('*/5 * * * *', 'crm.cron.log_crm_heartbeat'),
     ('0 */12 * * *', 'crm.cron.update_low_stock'),